@@ -9,6 +9,7 @@ Run: uv run python examples/01_primitives.py
 
 from threejs_viewer import viewer
 import math
+import time
 
 # Connect to viewer (starts WebSocket server, waits for browser)
 v = viewer()
@@ -57,6 +58,6 @@ print("Scene created! Press Ctrl+C to exit.")
 # Keep the server running
 try:
     while True:
-        pass
+        time.sleep(1)
 except KeyboardInterrupt:
     v.disconnect()
@@ -7,6 +7,8 @@ Shows helices with colors mapped to height/velocity/curvature.
 Run: uv run python examples/02_polylines.py
 """
 
+import time
+
 import numpy as np
 
 from threejs_viewer import viewer
@@ -24,10 +26,12 @@ v.add_box(
 # === Helix with height-based coloring (viridis) ===
 def make_helix(radius, height, turns, n_points):
     t = np.linspace(0, turns * 2 * np.pi, n_points)
-    x = radius * np.cos(t)
-    y = radius * np.sin(t)
-    z = np.linspace(0, height, n_points)
-    return np.column_stack([x, y, z])
+    points = np.empty((n_points, 3), dtype=np.float32)
+    np.cos(t, out=points[:, 0])
+    np.sin(t, out=points[:, 1])
+    points[:, :2] *= radius
+    points[:, 2] = np.linspace(0, height, n_points)
+    return points
 
 
 helix1 = make_helix(radius=1.5, height=4, turns=5, n_points=500)
@@ -41,10 +45,13 @@ v.add_polyline(
 def make_spiral(max_radius, height, turns, n_points):
     t = np.linspace(0, turns * 2 * np.pi, n_points)
     r = np.linspace(0.1, max_radius, n_points)
-    x = r * np.cos(t)
-    y = r * np.sin(t)
-    z = np.linspace(0, height, n_points)
-    return np.column_stack([x, y, z])
+    points = np.empty((n_points, 3), dtype=np.float32)
+    np.cos(t, out=points[:, 0])
+    np.sin(t, out=points[:, 1])
+    points[:, 0] *= r
+    points[:, 1] *= r
+    points[:, 2] = np.linspace(0, height, n_points)
+    return points
 
 
 spiral = make_spiral(max_radius=2, height=3, turns=4, n_points=400)
@@ -52,8 +59,9 @@ spiral = make_spiral(max_radius=2, height=3, turns=4, n_points=400)
 spiral[:, 0] += 5
 
 # Color by "velocity" (derivative magnitude)
-velocity = np.sqrt(np.sum(np.diff(spiral, axis=0) ** 2, axis=1))
-velocity = np.append(velocity, velocity[-1])  # Match length
+velocity = np.empty(len(spiral), dtype=np.float32)
+np.sqrt(np.sum(np.diff(spiral, axis=0) ** 2, axis=1), out=velocity[:-1])
+velocity[-1] = velocity[-2]  # Match length
 v.add_polyline(
     "spiral_plasma", spiral, colors=velocity, colormap="plasma", line_width=3
 )
@@ -62,10 +70,11 @@ v.add_polyline(
 # === Lissajous curve with parameter coloring (turbo) ===
 def make_lissajous_3d(a, b, c, delta, n_points):
     t = np.linspace(0, 2 * np.pi, n_points)
-    x = np.sin(a * t + delta)
-    y = np.sin(b * t)
-    z = np.sin(c * t)
-    return np.column_stack([x, y, z])
+    points = np.empty((n_points, 3), dtype=np.float32)
+    np.sin(a * t + delta, out=points[:, 0])
+    np.sin(b * t, out=points[:, 1])
+    np.sin(c * t, out=points[:, 2])
+    return points
 
 
 lissajous = make_lissajous_3d(a=3, b=4, c=5, delta=np.pi / 2, n_points=1000)
@@ -94,6 +103,6 @@ print("Press Ctrl+C to exit.")
 
 try:
     while True:
-        pass
+        time.sleep(1)
 except KeyboardInterrupt:
     v.disconnect()
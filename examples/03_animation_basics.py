@@ -8,6 +8,7 @@ Run: uv run python examples/03_animation_basics.py
 """
 
 import math
+import time
 
 
 from threejs_viewer import Animation, viewer
@@ -18,7 +19,7 @@ def make_transform_matrix(position, rotation_z=0, scale=1.0):
     c, s = math.cos(rotation_z), math.sin(rotation_z)
 
     # Column-major order
-    return [
+    return (
         scale * c,
         scale * s,
         0,
@@ -35,7 +36,7 @@ def make_transform_matrix(position, rotation_z=0, scale=1.0):
         position[1],
         position[2],
         1,
-    ]
+    )
 
 
 v = viewer()
@@ -87,46 +88,56 @@ duration = 10.0  # seconds
 fps = 30
 n_frames = int(duration * fps)
 
+# One column per object in the animation's transform buffer
+object_ids = ["sun"] + [planet["id"] for planet in planets] + ["moon"]
 animation = Animation(loop=True)
+animation.preallocate(object_ids, n_frames)
+
+# Sun stays still (but we include it for completeness)
+animation.matrices[:, 0] = make_transform_matrix((0, 0, 0))
+
+# Angular velocities and orbit radii, computed once outside the frame loop
+orbits = [
+    (j, 2 * math.pi / planet["period"], planet["orbit_radius"])
+    for j, planet in enumerate(planets, start=1)
+]
+earth_omega = 2 * math.pi / 5.0
+moon_omega = 2 * math.pi / 0.8  # Fast orbit around earth
 
 for i in range(n_frames):
     t = i / fps
-    transforms = {}
-
-    # Sun stays still (but we include it for completeness)
-    transforms["sun"] = make_transform_matrix([0, 0, 0])
+    animation.times[i] = t
+    transforms = animation.matrices[i]
 
     # Animate each planet
-    for planet in planets:
-        angle = 2 * math.pi * t / planet["period"]
-        x = planet["orbit_radius"] * math.cos(angle)
-        y = planet["orbit_radius"] * math.sin(angle)
-        transforms[planet["id"]] = make_transform_matrix([x, y, 0])
+    for j, omega, orbit_radius in orbits:
+        angle = omega * t
+        x = orbit_radius * math.cos(angle)
+        y = orbit_radius * math.sin(angle)
+        transforms[j] = make_transform_matrix((x, y, 0))
 
     # Moon orbits Earth
-    earth_angle = 2 * math.pi * t / 5.0
+    earth_angle = earth_omega * t
     earth_x = 4.5 * math.cos(earth_angle)
     earth_y = 4.5 * math.sin(earth_angle)
 
-    moon_angle = 2 * math.pi * t / 0.8  # Fast orbit around earth
+    moon_angle = moon_omega * t
     moon_x = earth_x + 0.6 * math.cos(moon_angle)
     moon_y = earth_y + 0.6 * math.sin(moon_angle)
-    transforms["moon"] = make_transform_matrix([moon_x, moon_y, 0])
-
-    animation.add_frame(time=t, transforms=transforms)
+    transforms[-1] = make_transform_matrix((moon_x, moon_y, 0))
 
 # Add timeline markers for notable events
 animation.add_marker(0.0, "Animation start", color=0x00FF00)
 animation.add_marker(5.0, "Halfway point", color=0xFFFF00)
 
-# Load the animation
-v.load_animation(animation)
+# Load the animation (rotations sent as int16 fixed-point, translations as float32)
+v.load_animation(animation, quantize=True)
 
 print(f"Animation loaded: {animation.n_frames} frames, {animation.duration:.1f}s")
 print("Press Ctrl+C to exit.")
 
 try:
     while True:
-        pass
+        time.sleep(1)
 except KeyboardInterrupt:
     v.disconnect()
@@ -10,21 +10,34 @@ Run: uv run python examples/04_flying_teapots.py
 """
 
 import math
+import time
 from pathlib import Path
 
+import numpy as np
+
 from threejs_viewer import Animation, viewer
 
 TEAPOT_PATH = Path(__file__).parent / "teapot.obj"
 
 
-def make_transform_matrix(position, rotation=(0, 0, 0), scale=1.0):
-    """Create a 4x4 transform matrix (column-major) with full rotation."""
-    rx, ry, rz = rotation
+def make_transform_matrices(position, rotation, scale=1.0):
+    """
+    Create 4x4 transform matrices (column-major) with full rotation.
+
+    Args:
+        position: array of shape (..., 3)
+        rotation: array of shape (..., 3) with Euler angles (rx, ry, rz)
+        scale: uniform scale factor
+
+    Returns:
+        float32 array of shape (..., 16)
+    """
+    rx, ry, rz = rotation[..., 0], rotation[..., 1], rotation[..., 2]
 
     # Rotation matrices
-    cx, sx = math.cos(rx), math.sin(rx)
-    cy, sy = math.cos(ry), math.sin(ry)
-    cz, sz = math.cos(rz), math.sin(rz)
+    cx, sx = np.cos(rx), np.sin(rx)
+    cy, sy = np.cos(ry), np.sin(ry)
+    cz, sz = np.cos(rz), np.sin(rz)
 
     # Combined rotation matrix R = Rz * Ry * Rx (in column-major order)
     r00 = cy * cz
@@ -37,25 +50,31 @@ def make_transform_matrix(position, rotation=(0, 0, 0), scale=1.0):
     r21 = cx * sy * sz - sx * cz
     r22 = cx * cy
 
+    zeros = np.zeros_like(r00)
+    ones = np.ones_like(r00)
+
     # Column-major 4x4 matrix
-    return [
-        scale * r00,
-        scale * r01,
-        scale * r02,
-        0,
-        scale * r10,
-        scale * r11,
-        scale * r12,
-        0,
-        scale * r20,
-        scale * r21,
-        scale * r22,
-        0,
-        position[0],
-        position[1],
-        position[2],
-        1,
-    ]
+    return np.stack(
+        [
+            scale * r00,
+            scale * r01,
+            scale * r02,
+            zeros,
+            scale * r10,
+            scale * r11,
+            scale * r12,
+            zeros,
+            scale * r20,
+            scale * r21,
+            scale * r22,
+            zeros,
+            position[..., 0],
+            position[..., 1],
+            position[..., 2],
+            ones,
+        ],
+        axis=-1,
+    ).astype(np.float32)
 
 
 v = viewer()
@@ -65,33 +84,52 @@ v.clear()
 N_TEAPOTS = 12
 TEAPOT_SCALE = 0.4  # Scale for the Three.js teapot model
 
-# Add ground plane
-v.add_box(
-    "ground", width=20, height=20, depth=0.05, color=0x2A2A2A, position=[0, 0, -0.025]
-)
-
-# Add some reference pillars
-for i in range(4):
-    angle = i * math.pi / 2 + math.pi / 4
-    x, y = 8 * math.cos(angle), 8 * math.sin(angle)
-    v.add_cylinder(
-        f"pillar_{i}",
-        radius_top=0.3,
-        radius_bottom=0.4,
-        height=6,
-        color=0x666666,
-        position=[x, y, 3],
+# Register the whole scene in a single message
+with v.batch_registration():
+    # Add ground plane
+    v.add_box(
+        "ground",
+        width=20,
+        height=20,
+        depth=0.05,
+        color=0x2A2A2A,
+        position=[0, 0, -0.025],
     )
 
-# Load teapots via websocket
-print(f"Loading {N_TEAPOTS} teapots...")
-for i in range(N_TEAPOTS):
-    v.add_model_binary(f"teapot_{i}", TEAPOT_PATH, format="obj")
+    # Add some reference pillars
+    for i in range(4):
+        angle = i * math.pi / 2 + math.pi / 4
+        x, y = 8 * math.cos(angle), 8 * math.sin(angle)
+        v.add_cylinder(
+            f"pillar_{i}",
+            radius_top=0.3,
+            radius_bottom=0.4,
+            height=6,
+            color=0x666666,
+            position=[x, y, 3],
+        )
+
+    # Load teapots via websocket
+    print(f"Loading {N_TEAPOTS} teapots...")
+    for i in range(N_TEAPOTS):
+        v.add_model_binary(f"teapot_{i}", TEAPOT_PATH, format="obj")
 
 
 # Define flight paths - each teapot follows a unique path
 def flight_path(t, teapot_idx):
-    """Compute position and rotation for a teapot at time t."""
+    """
+    Compute positions and rotations for teapots over time.
+
+    Args:
+        t: array of shape (F,) with frame times
+        teapot_idx: array of shape (T,) with teapot indices
+
+    Returns:
+        (positions, rotations), each of shape (F, T, 3)
+    """
+    t = t[:, None]
+    teapot_idx = teapot_idx[None, :]
+
     freq_x = 1 + (teapot_idx % 3) * 0.3
     freq_y = 1.5 + (teapot_idx % 4) * 0.2
     freq_z = 0.5 + (teapot_idx % 5) * 0.15
@@ -99,16 +137,16 @@ def flight_path(t, teapot_idx):
     phase = teapot_idx * 2 * math.pi / N_TEAPOTS
 
     # Position on a 3D curve
-    x = 6 * math.sin(freq_x * t + phase)
-    y = 6 * math.cos(freq_y * t + phase * 1.3)
-    z = 3 + 2 * math.sin(freq_z * t + phase * 0.7)
+    x = 6 * np.sin(freq_x * t + phase)
+    y = 6 * np.cos(freq_y * t + phase * 1.3)
+    z = 3 + 2 * np.sin(freq_z * t + phase * 0.7)
 
     # Rotation - teapots tumble as they fly
     rx = t * 0.5 + phase
     ry = t * 0.3 + teapot_idx * 0.5
-    rz = math.sin(t * 0.8 + phase) * 0.5
+    rz = np.sin(t * 0.8 + phase) * 0.5
 
-    return (x, y, z), (rx, ry, rz)
+    return np.stack([x, y, z], axis=-1), np.stack([rx, ry, rz], axis=-1)
 
 
 # Create animation
@@ -117,19 +155,15 @@ fps = 30
 n_frames = int(duration * fps)
 
 print("Computing flight paths...")
-animation = Animation(loop=True)
-
-for i in range(n_frames):
-    t = i / fps
-    transforms = {}
+times = np.arange(n_frames) / fps
+positions, rotations = flight_path(times, np.arange(N_TEAPOTS))
+matrices = make_transform_matrices(positions, rotations, TEAPOT_SCALE)
 
-    for teapot_idx in range(N_TEAPOTS):
-        pos, rot = flight_path(t, teapot_idx)
-        transforms[f"teapot_{teapot_idx}"] = make_transform_matrix(
-            pos, rot, TEAPOT_SCALE
-        )
-
-    animation.add_frame(time=t, transforms=transforms)
+teapot_ids = [f"teapot_{i}" for i in range(N_TEAPOTS)]
+animation = Animation(loop=True)
+animation.preallocate(teapot_ids, n_frames)
+animation.times[:] = times
+animation.matrices[:] = matrices
 
 # Add some markers
 animation.add_marker(0.0, "Teapots take flight!", color=0x00FF00)
@@ -137,13 +171,14 @@ animation.add_marker(5.0, "Graceful dance", color=0x00FFFF)
 animation.add_marker(10.0, "Mid-flight", color=0xFFFF00)
 animation.add_marker(15.0, "Coming around", color=0xFF00FF)
 
-v.load_animation(animation)
+# Rotations are sent as int16 fixed-point, translations stay float32
+v.load_animation(animation, quantize=True)
 
 print(f"Animation loaded: {N_TEAPOTS} teapots, {animation.n_frames} frames")
 print("Press Ctrl+C to exit.")
 
 try:
     while True:
-        pass
+        time.sleep(1)
 except KeyboardInterrupt:
     v.disconnect()
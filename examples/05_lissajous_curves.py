@@ -8,39 +8,38 @@ Run: uv run python examples/05_lissajous_curves.py
 """
 
 import math
+import time
 
 import numpy as np
 
 from threejs_viewer import Animation, viewer
 
 
-def make_transform_matrix(position, scale=1.0):
-    """Create a simple translation matrix."""
-    return [
-        scale,
-        0,
-        0,
-        0,
-        0,
-        scale,
-        0,
-        0,
-        0,
-        0,
-        scale,
-        0,
-        position[0],
-        position[1],
-        position[2],
-        1,
-    ]
+def make_transform_matrices(positions, scale=1.0):
+    """
+    Create simple translation matrices (column-major).
+
+    Args:
+        positions: array of shape (..., 3)
+        scale: uniform scale factor
+
+    Returns:
+        float32 array of shape (..., 16)
+    """
+    matrices = np.zeros(positions.shape[:-1] + (16,), dtype=np.float32)
+    matrices[..., 0] = scale
+    matrices[..., 5] = scale
+    matrices[..., 10] = scale
+    matrices[..., 12:15] = positions
+    matrices[..., 15] = 1
+    return matrices
 
 
 def lissajous_3d(t, a, b, c, delta_x=0, delta_y=0, scale=3):
-    """Compute 3D Lissajous curve point."""
-    x = scale * math.sin(a * t + delta_x)
-    y = scale * math.sin(b * t + delta_y)
-    z = scale * math.sin(c * t) + scale + 0.5  # Offset above ground
+    """Compute 3D Lissajous curve points (t may be a scalar or an array)."""
+    x = scale * np.sin(a * t + delta_x)
+    y = scale * np.sin(b * t + delta_y)
+    z = scale * np.sin(c * t) + scale + 0.5  # Offset above ground
     return x, y, z
 
 
@@ -60,11 +59,10 @@ SCALE = 3
 
 # Generate the full curve for static display
 n_curve_points = 2000
-curve_points = np.zeros((n_curve_points, 3))
 t_values = np.linspace(0, 2 * math.pi, n_curve_points)
-
-for i, t in enumerate(t_values):
-    curve_points[i] = lissajous_3d(t, A, B, C, DELTA_X, DELTA_Y, SCALE)
+curve_points = np.stack(
+    lissajous_3d(t_values, A, B, C, DELTA_X, DELTA_Y, SCALE), axis=1
+).astype(np.float32)
 
 # Add the curve with gradient coloring
 v.add_polyline(
@@ -89,26 +87,20 @@ duration = 10.0
 fps = 60  # Smooth tracing
 n_frames = int(duration * fps)
 
-animation = Animation(loop=True)
+# Tracer at offset 0, trail spheres at increasing time offsets behind it
+object_ids = ["tracer"] + [f"trail_{i}" for i in range(N_TRAIL)]
+offsets = np.concatenate([[0.0], (np.arange(N_TRAIL) + 1) * 0.05])
 
-for frame_idx in range(n_frames):
-    t_anim = frame_idx / fps
-    t_param = (t_anim / duration) * 2 * math.pi  # Map to curve parameter
+t_anim = np.arange(n_frames) / fps
+t_param = (t_anim / duration) * 2 * math.pi  # Map to curve parameter
+t_objects = t_param[:, None] - offsets[None, :]  # (n_frames, N_TRAIL + 1)
 
-    transforms = {}
+positions = np.stack(lissajous_3d(t_objects, A, B, C, DELTA_X, DELTA_Y, SCALE), axis=-1)
 
-    # Main tracer position
-    pos = lissajous_3d(t_param, A, B, C, DELTA_X, DELTA_Y, SCALE)
-    transforms["tracer"] = make_transform_matrix(pos)
-
-    # Trail positions (previous positions)
-    for i in range(N_TRAIL):
-        trail_offset = (i + 1) * 0.05  # Time offset for each trail sphere
-        t_trail = t_param - trail_offset
-        trail_pos = lissajous_3d(t_trail, A, B, C, DELTA_X, DELTA_Y, SCALE)
-        transforms[f"trail_{i}"] = make_transform_matrix(trail_pos)
-
-    animation.add_frame(time=t_anim, transforms=transforms)
+animation = Animation(loop=True)
+animation.preallocate(object_ids, n_frames)
+animation.times[:] = t_anim
+animation.matrices[:] = make_transform_matrices(positions)
 
 # Markers at interesting points
 animation.add_marker(0.0, "Start", color=0x00FF00)
@@ -123,6 +115,6 @@ print("Press Ctrl+C to exit.")
 
 try:
     while True:
-        pass
+        time.sleep(1)
 except KeyboardInterrupt:
     v.disconnect()
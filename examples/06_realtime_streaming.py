@@ -11,8 +11,23 @@ Run: uv run python examples/06_realtime_streaming.py
 import math
 import time
 
+import numpy as np
+
 from threejs_viewer import viewer
 
+
+def euler_to_quaternion(x, y, z):
+    """Quaternion [x, y, z, w] for Euler angles in Three.js' default XYZ order."""
+    c1, c2, c3 = math.cos(x / 2), math.cos(y / 2), math.cos(z / 2)
+    s1, s2, s3 = math.sin(x / 2), math.sin(y / 2), math.sin(z / 2)
+    return [
+        s1 * c2 * c3 + c1 * s2 * s3,
+        c1 * s2 * c3 - s1 * c2 * s3,
+        c1 * c2 * s3 + s1 * s2 * c3,
+        c1 * c2 * c3 - s1 * s2 * s3,
+    ]
+
+
 v = viewer()
 v.clear()
 v.stop_animation()  # Clear any previous animation UI
@@ -53,35 +68,39 @@ for i in range(GRID_SIZE):
 # Also add a rotating box in the center
 v.add_box("center_box", width=1, height=1, depth=1, color=0xFFAA00, position=[0, 0, 2])
 
+# One transform row per object: [px, py, pz, qx, qy, qz, qw, scale]
+object_ids = [sphere["id"] for sphere in spheres] + ["center_box"]
+transforms = np.zeros((len(object_ids), 8), dtype=np.float32)
+transforms[:, 6] = 1  # Identity rotation
+transforms[:, 7] = 1  # Unit scale
+transforms[:-1, 0] = [sphere["x"] for sphere in spheres]
+transforms[:-1, 1] = [sphere["y"] for sphere in spheres]
+freqs = np.array([sphere["freq"] for sphere in spheres])
+phases = np.array([sphere["phase"] for sphere in spheres])
+
 print(f"Streaming {len(spheres)} spheres at ~60 fps. Press Ctrl+C to exit.")
 
 # Real-time animation loop
 TARGET_FPS = 60
 FRAME_TIME = 1.0 / TARGET_FPS
-start_time = time.time()
+start_time = time.perf_counter()
+frame_deadline = start_time  # Scheduled time of the current frame
 frame_count = 0
 
 try:
     while True:
-        t = time.time() - start_time
-
-        # Batch update all sphere positions
-        transforms = {}
+        t = frame_deadline - start_time
 
-        for sphere in spheres:
-            # Bouncing motion with wave propagation
-            z = 0.3 + 0.5 * abs(math.sin(sphere["freq"] * t + sphere["phase"]))
-            transforms[sphere["id"]] = {"position": [sphere["x"], sphere["y"], z]}
+        # Bouncing motion with wave propagation
+        transforms[:-1, 2] = 0.3 + 0.5 * np.abs(np.sin(freqs * t + phases))
 
         # Rotating center box
         angle = t * 0.8
-        transforms["center_box"] = {
-            "position": [0, 0, 2 + 0.5 * math.sin(t * 2)],
-            "rotation": [t * 0.3, angle, t * 0.2],
-        }
+        transforms[-1, 2] = 2 + 0.5 * math.sin(t * 2)
+        transforms[-1, 3:7] = euler_to_quaternion(t * 0.3, angle, t * 0.2)
 
-        # Send batch update
-        v.batch_update(transforms)
+        # Send batch update, skipping objects that haven't visibly moved
+        v.batch_update_binary(object_ids, transforms, epsilon=1e-4)
 
         # Also update colors periodically (every 30 frames)
         frame_count += 1
@@ -90,15 +109,17 @@ try:
             intensity = int(128 + 127 * math.sin(t * 3))
             v.set_color("center_box", (intensity << 16) | (intensity << 8) | 0)
 
-        # Frame rate control
-        elapsed = time.time() - start_time - t
-        sleep_time = FRAME_TIME - elapsed
+        # Frame rate control: sleep until the next frame's deadline
+        frame_deadline += FRAME_TIME
+        sleep_time = frame_deadline - time.perf_counter()
         if sleep_time > 0:
             time.sleep(sleep_time)
+        elif sleep_time < -FRAME_TIME:
+            frame_deadline -= sleep_time  # Fell behind: resync instead of bursting
 
         # Print FPS every second
         if frame_count % TARGET_FPS == 0:
-            actual_fps = frame_count / (time.time() - start_time)
+            actual_fps = frame_count / (time.perf_counter() - start_time)
             print(f"Running: {actual_fps:.1f} fps, t={t:.1f}s", end="\r")
 
 except KeyboardInterrupt:
@@ -7,8 +7,6 @@ racing along the path. Tests polyline rendering and batch transform updates.
 Run: uv run python examples/07_stress_test.py
 """
 
-import colorsys
-import random
 import time
 from pathlib import Path
 
@@ -16,6 +14,11 @@ import numpy as np
 
 from threejs_viewer import viewer
 
+try:
+    from numba import njit, prange
+except ImportError:  # Fall back to the vectorized NumPy versions
+    njit = None
+
 
 def torus_knot(t: np.ndarray, p: int = 3, q: int = 7, scale: float = 5.0):
     """Torus knot parametric curve with analytical tangent."""
@@ -57,10 +60,39 @@ def compute_frame(dx, dy, dz):
     return (tx, ty, tz), (nx, ny, nz), (bx, by, bz)
 
 
-def create_tube(t, pos, tangent, tube_radius=0.3, windings=500, z_offset=5.0):
-    """Create a tube around a curve by sweeping a circle along it."""
-    x, y, z = pos
-    dx, dy, dz = tangent
+def hsv_to_rgb(h, s, v):
+    """Vectorized colorsys.hsv_to_rgb: hues of shape (N,) to RGB of shape (N, 3)."""
+    sector = np.floor(h * 6.0)
+    f = h * 6.0 - sector
+    sector = sector.astype(np.int64) % 6
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    r = np.choose(sector, [v, q, p, p, t, v])
+    g = np.choose(sector, [t, v, v, q, p, p])
+    b = np.choose(sector, [p, p, t, v, v, q])
+    return np.stack([r, g, b], axis=1)
+
+
+def create_tube(
+    t, tube_radius=0.3, windings=500, z_offset=5.0, p=3, q=7, scale=5.0, r=0.5
+):
+    """
+    Create a tube around a torus knot by sweeping a circle along it.
+
+    Returns the tube points as three contiguous float32 arrays (px, py, pz).
+    """
+    px = np.empty(t.size, dtype=np.float32)
+    py = np.empty(t.size, dtype=np.float32)
+    pz = np.empty(t.size, dtype=np.float32)
+
+    if njit is not None:
+        _create_tube_kernel(
+            t, scale, p, q, r, tube_radius, windings, z_offset, px, py, pz
+        )
+        return px, py, pz
+
+    (x, y, z), (dx, dy, dz) = torus_knot(t, p=p, q=q, scale=scale)
 
     _, N, B = compute_frame(dx, dy, dz)
     nx, ny, nz = N
@@ -70,11 +102,75 @@ def create_tube(t, pos, tangent, tube_radius=0.3, windings=500, z_offset=5.0):
     cos_theta = np.cos(theta)
     sin_theta = np.sin(theta)
 
-    px = x + tube_radius * (cos_theta * nx + sin_theta * bx)
-    py = y + tube_radius * (cos_theta * ny + sin_theta * by)
-    pz = z + tube_radius * (cos_theta * nz + sin_theta * bz) + z_offset
-
-    return np.column_stack([px, py, pz]).astype(np.float32)
+    px[:] = x + tube_radius * (cos_theta * nx + sin_theta * bx)
+    py[:] = y + tube_radius * (cos_theta * ny + sin_theta * by)
+    pz[:] = z + tube_radius * (cos_theta * nz + sin_theta * bz) + z_offset
+    return px, py, pz
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _create_tube_kernel(
+        t, scale, p, q, r, tube_radius, windings, z_offset, px, py, pz
+    ):
+        """Fused torus knot + frame + sweep, one pass without temporaries."""
+        for i in prange(t.size):
+            cp, sp = np.cos(p * t[i]), np.sin(p * t[i])
+            cq, sq = np.cos(q * t[i]), np.sin(q * t[i])
+            cw, sw = np.cos(windings * t[i]), np.sin(windings * t[i])
+
+            x = scale * cp * (1 + r * cq)
+            y = scale * sp * (1 + r * cq)
+            z = scale * r * sq
+            dx = scale * (-p * sp * (1 + r * cq) - r * q * cp * sq)
+            dy = scale * (p * cp * (1 + r * cq) - r * q * sp * sq)
+            dz = scale * r * q * cq
+
+            t_len = np.sqrt(dx * dx + dy * dy + dz * dz) + 1e-8
+            tx, ty, tz = dx / t_len, dy / t_len, dz / t_len
+
+            # normal = cross(up, tangent) with up = (0, 0, 1)
+            nx, ny = -ty, tx
+            n_len = np.sqrt(nx * nx + ny * ny) + 1e-8
+            nx, ny = nx / n_len, ny / n_len
+
+            # binormal = cross(tangent, normal), normal has no z component
+            bx = -tz * ny
+            by = tz * nx
+            bz = tx * ny - ty * nx
+
+            px[i] = x + tube_radius * (cw * nx + sw * bx)
+            py[i] = y + tube_radius * (cw * ny + sw * by)
+            pz[i] = z + tube_radius * (sw * bz) + z_offset
+
+    @njit(fastmath=True, cache=True)
+    def _followers_kernel(px, py, pz, offsets, speeds, frame, lookahead, out):
+        """Positions and orientations of all followers, one pass per row."""
+        n = px.size
+        for i in range(offsets.size):
+            j = np.int64(offsets[i] + frame * speeds[i]) % n
+            k = (j + lookahead) % n
+            dx, dy, dz = px[k] - px[j], py[k] - py[j], pz[k] - pz[j]
+            out[i, 0], out[i, 1], out[i, 2] = px[j], py[j], pz[j]
+
+            # Rotate Y onto unit d: q = normalize(cross(y, d), 1 + dot(y, d)),
+            # which needs no trigonometry
+            d_len = np.sqrt(dx * dx + dy * dy + dz * dz) + 1e-8
+            dot = dy / d_len
+            if dot > 0.9999:
+                out[i, 3], out[i, 4], out[i, 5], out[i, 6] = 0.0, 0.0, 0.0, 1.0
+            elif dot < -0.9999:
+                out[i, 3], out[i, 4], out[i, 5], out[i, 6] = 1.0, 0.0, 0.0, 0.0
+            else:
+                qx, qz, qw = dz / d_len, -dx / d_len, 1.0 + dot
+                inv = 1.0 / np.sqrt(qx * qx + qz * qz + qw * qw)
+                out[i, 3], out[i, 4], out[i, 5], out[i, 6] = (
+                    qx * inv,
+                    0.0,
+                    qz * inv,
+                    qw * inv,
+                )
 
 
 # Configuration
@@ -87,10 +183,10 @@ print(f"Generating torus knot with {NUM_POINTS:,} points...")
 start = time.time()
 
 t = np.linspace(0, 2 * np.pi, NUM_POINTS, dtype=np.float64)
-pos, tangent = torus_knot(t)
-points = create_tube(t, pos, tangent, tube_radius=TUBE_RADIUS, windings=WINDINGS)
+px, py, pz = create_tube(t, tube_radius=TUBE_RADIUS, windings=WINDINGS)
 
-print(f"Generated in {time.time() - start:.2f}s ({points.nbytes / 1024 / 1024:.1f} MB)")
+n_bytes = px.nbytes + py.nbytes + pz.nbytes
+print(f"Generated in {time.time() - start:.2f}s ({n_bytes / 1024 / 1024:.1f} MB)")
 
 # Connect and send
 v = viewer()
@@ -100,7 +196,11 @@ v.stop_animation()
 print("Sending polyline to viewer...")
 start = time.time()
 v.add_polyline(
-    "tube", points, colors=t.astype(np.float32), colormap="turbo", line_width=2
+    "tube",
+    np.stack([px, py, pz], axis=1),
+    colors=t,  # Cast to float32 while normalizing, inside add_polyline
+    colormap="turbo",
+    line_width=2,
 )
 print(f"Sent in {time.time() - start:.2f}s")
 
@@ -111,114 +211,146 @@ TEAPOT_PATH = Path(__file__).parent / "teapot.obj"
 NUM_TEAPOTS = 20
 PRIMITIVES = ["sphere", "box", "cylinder", "capsule", "cone"]
 
-followers = []
-for i in range(NUM_FOLLOWERS):
-    hue = random.uniform(0, 1)
-    r, g, b = colorsys.hsv_to_rgb(hue, 0.9, 0.9)
-    color = (int(r * 255) << 16) | (int(g * 255) << 8) | int(b * 255)
-    size = random.uniform(0.1, 0.3)
-
-    fid = f"f{i}"
-    ptype = PRIMITIVES[i % len(PRIMITIVES)]
-
-    if ptype == "sphere":
-        v.add_sphere(fid, radius=size, color=color)
-    elif ptype == "box":
-        v.add_box(fid, width=size, height=size, depth=size * 2, color=color)
-    elif ptype == "cylinder":
-        v.add_cylinder(
-            fid,
-            radius_top=size * 0.4,
-            radius_bottom=size * 0.4,
-            height=size * 2,
-            color=color,
-        )
-    elif ptype == "capsule":
-        v.add_capsule(fid, radius=size * 0.4, length=size, color=color)
-    elif ptype == "cone":
-        v.add_cylinder(
-            fid, radius_top=0, radius_bottom=size * 0.5, height=size * 2, color=color
-        )
+# Random follower properties, drawn for all followers at once
+rng = np.random.default_rng()
+rgb = (hsv_to_rgb(rng.uniform(0, 1, NUM_FOLLOWERS), 0.9, 0.9) * 255).astype(np.uint32)
+colors = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+sizes = rng.uniform(0.1, 0.3, NUM_FOLLOWERS)
+
+# Register all followers in a single message
+with v.batch_registration():
+    for i in range(NUM_FOLLOWERS):
+        color = colors[i].item()
+        size = sizes[i].item()
+
+        fid = f"f{i}"
+        ptype = PRIMITIVES[i % len(PRIMITIVES)]
+
+        if ptype == "sphere":
+            v.add_sphere(fid, radius=size, color=color)
+        elif ptype == "box":
+            v.add_box(fid, width=size, height=size, depth=size * 2, color=color)
+        elif ptype == "cylinder":
+            v.add_cylinder(
+                fid,
+                radius_top=size * 0.4,
+                radius_bottom=size * 0.4,
+                height=size * 2,
+                color=color,
+            )
+        elif ptype == "capsule":
+            v.add_capsule(fid, radius=size * 0.4, length=size, color=color)
+        elif ptype == "cone":
+            v.add_cylinder(
+                fid,
+                radius_top=0,
+                radius_bottom=size * 0.5,
+                height=size * 2,
+                color=color,
+            )
+
+    # Add teapots
+    print(f"Adding {NUM_TEAPOTS} teapots...")
+    for i in range(NUM_TEAPOTS):
+        v.add_model_binary(f"teapot{i}", TEAPOT_PATH, format="obj")
+
+follower_ids = [f"f{i}" for i in range(NUM_FOLLOWERS)]
+follower_ids += [f"teapot{i}" for i in range(NUM_TEAPOTS)]
+speeds = np.concatenate(
+    [rng.uniform(5, 30, NUM_FOLLOWERS), rng.uniform(5, 20, NUM_TEAPOTS)]
+)
+offsets = rng.integers(0, NUM_POINTS, len(follower_ids)).astype(np.float64)
 
-    followers.append(
-        {
-            "id": fid,
-            "speed": random.uniform(5, 30),
-            "offset": random.randint(0, NUM_POINTS - 1),
-        }
-    )
 
-# Add teapots
-print(f"Adding {NUM_TEAPOTS} teapots...")
-for i in range(NUM_TEAPOTS):
-    fid = f"teapot{i}"
-    v.add_model_binary(fid, TEAPOT_PATH, format="obj")
-    followers.append(
-        {
-            "id": fid,
-            "speed": random.uniform(5, 20),
-            "offset": random.randint(0, NUM_POINTS - 1),
-            "scale": 0.2,  # 20% scale
-        }
-    )
+def quaternion_from_direction(dx, dy, dz, out=None):
+    """
+    Compute quaternions rotating the Y-axis to the given directions.
 
+    Args:
+        dx, dy, dz: direction components, arrays of shape (N,)
+        out: optional (N, 4) array to write into
 
-def quaternion_from_direction(direction):
-    """Compute quaternion to rotate Y-axis to given direction."""
-    d = direction / (np.linalg.norm(direction) + 1e-8)
-    y_axis = np.array([0, 1, 0])
-    dot = np.dot(y_axis, d)
+    Returns:
+        array of shape (N, 4) with quaternions as [x, y, z, w]
+    """
+    if out is None:
+        out = np.empty((len(dx), 4), dtype=np.float32)
+
+    d_len = np.sqrt(dx**2 + dy**2 + dz**2) + 1e-8
+    dot = dy / d_len  # dot(y_axis, d)
+
+    # axis = cross(y_axis, d) = (dz, 0, -dx)
+    axis_x, axis_z = dz / d_len, -dx / d_len
+    axis_len = np.sqrt(axis_x**2 + axis_z**2) + 1e-8
+
+    half = np.arccos(np.clip(dot, -1, 1)) / 2
+    s = np.sin(half) / axis_len
+
+    quat = np.stack([axis_x * s, np.zeros_like(s), axis_z * s, np.cos(half)], axis=1)
+
+    # Parallel and anti-parallel directions have no well-defined axis
+    quat[dot > 0.9999] = [0, 0, 0, 1]
+    quat[dot < -0.9999] = [1, 0, 0, 0]
+    out[:] = quat
+    return out
+
+
+def followers_update(frame, out, lookahead=100):
+    """
+    Write follower transforms for a frame into the (N, 8) block `out`.
+
+    Each follower sits at its current tube point and points towards the
+    point `lookahead` samples ahead. Column 7 (scale) is left untouched.
+    """
+    if njit is not None:
+        _followers_kernel(px, py, pz, offsets, speeds, frame, lookahead, out)
+        return
+
+    idx = (offsets + frame * speeds).astype(np.int64) % NUM_POINTS
+    idx_next = (idx + lookahead) % NUM_POINTS
+    x, y, z = px[idx], py[idx], pz[idx]
+    out[:, 0] = x
+    out[:, 1] = y
+    out[:, 2] = z
+    quaternion_from_direction(
+        px[idx_next] - x, py[idx_next] - y, pz[idx_next] - z, out=out[:, 3:7]
+    )
 
-    if dot > 0.9999:
-        return [0, 0, 0, 1]
-    if dot < -0.9999:
-        return [1, 0, 0, 0]
 
-    axis = np.cross(y_axis, d)
-    axis = axis / (np.linalg.norm(axis) + 1e-8)
-    angle = np.arccos(np.clip(dot, -1, 1))
-    half = angle / 2
-    s = np.sin(half)
-    return [axis[0] * s, axis[1] * s, axis[2] * s, np.cos(half)]
+# One row per follower: [px, py, pz, qx, qy, qz, qw, scale]
+transforms = np.empty((len(follower_ids), 8), dtype=np.float32)
+transforms[:, 7] = 1.0
+transforms[NUM_FOLLOWERS:, 7] = 0.2  # Teapots at 20% scale
 
+print(f"Animating {len(follower_ids)} objects. Press Ctrl+C to stop.")
 
-print(f"Animating {len(followers)} objects. Press Ctrl+C to stop.")
+TARGET_FPS = 60
+FRAME_TIME = 1.0 / TARGET_FPS
 
 frame = 0
-t_start = time.time()
+t_start = time.perf_counter()
+frame_deadline = t_start  # Scheduled time of the current frame
 
 try:
     while True:
-        loop_start = time.time()
-
-        transforms = {}
-        for f in followers:
-            idx = int((f["offset"] + frame * f["speed"]) % NUM_POINTS)
-            idx_next = (idx + 100) % NUM_POINTS
-            pos = points[idx]
-            tangent = points[idx_next] - pos
-            quat = quaternion_from_direction(tangent)
-
-            scale = f.get("scale", 1.0)
-            transforms[f["id"]] = {
-                "position": pos.tolist(),
-                "quaternion": quat,
-                "scale": [scale, scale, scale],
-            }
-
-        v.batch_update(transforms)
+        followers_update(frame, transforms)
+        v.batch_update_binary(follower_ids, transforms)
         frame += 1
 
-        if frame % 60 == 0:
-            elapsed = time.time() - t_start
+        if frame % TARGET_FPS == 0:
+            elapsed = time.perf_counter() - t_start
             fps = frame / elapsed
-            print(f"  {len(followers)} objects @ {fps:.1f} fps", end="\r")
+            print(f"  {len(follower_ids)} objects @ {fps:.1f} fps", end="\r")
 
-        sleep_time = 1 / 60 - (time.time() - loop_start)
+        # Sleep until the next frame's deadline
+        frame_deadline += FRAME_TIME
+        sleep_time = frame_deadline - time.perf_counter()
         if sleep_time > 0:
             time.sleep(sleep_time)
+        elif sleep_time < -FRAME_TIME:
+            frame_deadline -= sleep_time  # Fell behind: resync instead of bursting
 
 except KeyboardInterrupt:
-    elapsed = time.time() - t_start
+    elapsed = time.perf_counter() - t_start
     print(f"\nStopped: {frame} frames, {frame / elapsed:.1f} fps avg")
     v.disconnect()
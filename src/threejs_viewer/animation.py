@@ -10,6 +10,10 @@ from typing import Callable
 
 import numpy as np
 
+# Column-major 4x4 entries holding rotation/scale and translation
+_ROTATION_ENTRIES = [0, 1, 2, 4, 5, 6, 8, 9, 10]
+_TRANSLATION_ENTRIES = [12, 13, 14]
+
 
 @dataclass
 class Marker:
@@ -59,9 +63,20 @@ class Animation:
     loop: bool = True
     markers: list[Marker] = field(default_factory=list)
 
+    # Dense transform buffers, set by preallocate()
+    _object_ids: list[str] | None = field(default=None, init=False, repr=False)
+    _times: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _mats: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @property
     def duration(self) -> float:
         """Animation duration in seconds."""
+        if self._times is not None:
+            return float(self._times[-1]) if len(self._times) else 0.0
         if not self.frames:
             return 0.0
         return self.frames[-1].time
@@ -69,15 +84,71 @@ class Animation:
     @property
     def fps(self) -> float:
         """Approximate frames per second."""
-        if len(self.frames) < 2:
+        if self.n_frames < 2 or self.duration <= 0:
             return 0.0
-        return len(self.frames) / self.duration
+        return self.n_frames / self.duration
 
     @property
     def n_frames(self) -> int:
         """Number of frames."""
+        if self._times is not None:
+            return len(self._times)
         return len(self.frames)
 
+    @property
+    def is_preallocated(self) -> bool:
+        """Whether transforms are stored in dense buffers (see preallocate)."""
+        return self._mats is not None
+
+    @property
+    def object_ids(self) -> list[str]:
+        """Object IDs of the columns of `matrices`."""
+        return self._object_ids or []
+
+    @property
+    def times(self) -> np.ndarray:
+        """Frame times of a preallocated animation, shape (n_frames,)."""
+        if self._times is None:
+            raise RuntimeError("Animation is not preallocated.")
+        return self._times
+
+    @property
+    def matrices(self) -> np.ndarray:
+        """
+        Transforms of a preallocated animation.
+
+        float32 array of shape (n_frames, n_objects, 16) holding column-major
+        4x4 matrices, with objects ordered as in `object_ids`.
+        """
+        if self._mats is None:
+            raise RuntimeError("Animation is not preallocated.")
+        return self._mats
+
+    def preallocate(self, object_ids: list[str], n_frames: int) -> None:
+        """
+        Allocate dense buffers for the transforms of a fixed set of objects.
+
+        Fill `times` and `matrices` in place (ideally in one vectorized
+        step) instead of calling add_frame. The buffers are sent to the
+        viewer as raw float32 data, which is much smaller and faster than
+        per-frame JSON dicts. A preallocated animation only carries
+        transforms: it cannot be combined with add_frame, so animations
+        with per-frame colors, visibility or opacity must use add_frame
+        for everything.
+
+        Example:
+            animation = Animation(loop=True)
+            animation.preallocate(["a", "b"], n_frames=300)
+            animation.times[:] = np.arange(300) / 30
+            animation.matrices[:] = compute_matrices(animation.times)
+        """
+        if self.frames:
+            raise RuntimeError("Cannot preallocate an animation that has frames.")
+        self._object_ids = list(object_ids)
+        self._times = np.zeros(n_frames, dtype=np.float32)
+        self._mats = np.empty((n_frames, len(self._object_ids), 16), dtype=np.float32)
+        self._mats[:] = np.eye(4, dtype=np.float32).ravel()
+
     def add_frame(
         self,
         time: float,
@@ -87,6 +158,8 @@ class Animation:
         opacity: dict[str, float] | None = None,
     ) -> None:
         """Add a frame to the animation."""
+        if self._mats is not None:
+            raise RuntimeError("Cannot add frames to a preallocated animation.")
         self.frames.append(
             Frame(
                 time=time,
@@ -101,6 +174,49 @@ class Animation:
         """Add a labeled marker on the timeline."""
         self.markers.append(Marker(time=time, label=label, color=color))
 
+    def to_binary(self, quantize: bool = False) -> tuple[dict, bytes]:
+        """
+        Convert a preallocated animation to a header and a binary payload.
+
+        The payload is the float32 frame times followed by the float32
+        matrices, (n_frames, n_objects, 16) in C order.
+
+        With quantize=True, the matrices are sent as float32 translations
+        (n_frames, n_objects, 3) followed by the rotation/scale entries
+        (n_frames, n_objects, 9) as int16 fixed-point values, to be
+        multiplied by header["rotation_scale"]. This cuts a transform from
+        64 to 30 bytes; the bottom row is assumed to be [0, 0, 0, 1].
+        """
+        if self._mats is None:
+            raise RuntimeError("Animation is not preallocated.")
+        header = {
+            "duration": self.duration,
+            "fps": self.fps,
+            "loop": self.loop,
+            "ids": self.object_ids,
+            "n_frames": self.n_frames,
+            "markers": [
+                {"time": m.time, "label": m.label, "color": m.color}
+                for m in self.markers
+            ],
+        }
+        if not quantize:
+            payload = self._times.tobytes() + np.ascontiguousarray(self._mats).tobytes()
+            return header, payload
+
+        rotation = self._mats[..., _ROTATION_ENTRIES]
+        max_abs = float(np.abs(rotation).max()) if rotation.size else 0.0
+        scale = max_abs / np.iinfo(np.int16).max if max_abs > 0 else 1.0
+        quantized = np.rint(rotation * (1.0 / scale)).astype(np.int16)
+        header["rotation_scale"] = scale
+
+        payload = (
+            self._times.tobytes()
+            + self._mats[..., _TRANSLATION_ENTRIES].tobytes()
+            + quantized.tobytes()
+        )
+        return header, payload
+
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
         return {
@@ -9,23 +9,136 @@ import json
 import struct
 import threading
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
 import numpy as np
 from websockets.sync.server import serve as sync_serve
 
+try:
+    import msgpack
+except ImportError:  # Optional: fall back to JSON messages
+    msgpack = None
+
+# WebSocket subprotocol for MessagePack-encoded messages
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+# Object handles are sent as uint16
+MAX_HANDLES = 1 << 16
+
+# Payloads at least this large are sent as a fragmented message instead of
+# being copied into one buffer with their header
+FRAGMENT_MIN_PAYLOAD = 64 * 1024
+
+# Binary payload: a bytes-like object, or a list of them sent back to back
+Payload = Union[bytes, memoryview, List[Union[bytes, memoryview]]]
+
+# Colormap control points (RGB in [0, 1]), evenly spaced over [0, 1]
+_COLORMAPS = {
+    "viridis": [
+        (0.267, 0.004, 0.329),
+        (0.282, 0.140, 0.458),
+        (0.254, 0.265, 0.530),
+        (0.207, 0.372, 0.553),
+        (0.164, 0.471, 0.558),
+        (0.128, 0.567, 0.551),
+        (0.135, 0.659, 0.518),
+        (0.267, 0.749, 0.441),
+        (0.478, 0.821, 0.318),
+        (0.741, 0.873, 0.150),
+        (0.993, 0.906, 0.144),
+    ],
+    "plasma": [
+        (0.050, 0.030, 0.528),
+        (0.295, 0.012, 0.615),
+        (0.492, 0.012, 0.659),
+        (0.665, 0.139, 0.614),
+        (0.798, 0.280, 0.470),
+        (0.899, 0.396, 0.301),
+        (0.973, 0.559, 0.055),
+        (0.940, 0.975, 0.131),
+    ],
+    "turbo": [
+        (0.190, 0.072, 0.232),
+        (0.217, 0.336, 0.855),
+        (0.134, 0.659, 0.918),
+        (0.121, 0.866, 0.706),
+        (0.400, 0.974, 0.371),
+        (0.691, 0.974, 0.171),
+        (0.938, 0.847, 0.102),
+        (0.999, 0.582, 0.084),
+        (0.945, 0.278, 0.086),
+        (0.700, 0.072, 0.150),
+    ],
+}
+
+COLORMAP_LUT_SIZE = 1024
+
+
+def _build_colormap_lut(
+    stops: List[tuple], size: int = COLORMAP_LUT_SIZE
+) -> np.ndarray:
+    """Linearly interpolate colormap control points into a (size, 3) LUT."""
+    stops = np.asarray(stops, dtype=np.float64)
+    x = np.linspace(0, 1, size)
+    xp = np.linspace(0, 1, len(stops))
+    lut = np.stack([np.interp(x, xp, stops[:, c]) for c in range(3)], axis=1)
+    return lut.astype(np.float32)
+
+
+# Precomputed colormap lookup tables
+_COLORMAP_LUTS = {
+    name: _build_colormap_lut(stops) for name, stops in _COLORMAPS.items()
+}
+
+# The same tables as 8-bit RGB, as sent in polyline vertex colors
+_COLORMAP_LUTS_U8 = {
+    name: (lut * 255).astype(np.uint8) for name, lut in _COLORMAP_LUTS.items()
+}
+
+
+def _as_bytes(array: np.ndarray) -> memoryview:
+    """Zero-copy byte view of an array (copies only if not C-contiguous)."""
+    return memoryview(np.ascontiguousarray(array)).cast("B")
+
+
+def _pad4(data: bytes) -> bytes:
+    """Null-pad bytes to a 4-byte boundary."""
+    return data + b"\x00" * ((4 - len(data) % 4) % 4)
+
+
+def _payload_chunks(payload: Optional[Payload]) -> list:
+    """Normalize a payload to a list of non-empty byte chunks."""
+    if payload is None:
+        return []
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        payload = [payload]
+    return [chunk for chunk in payload if len(chunk)]
+
 
 class ViewerClient:
     """
     Synchronous client for controlling the Three.js viewer.
     Runs a WebSocket server that the browser viewer connects to.
+
+    Per-message compression is off by default: the viewer usually runs on
+    the same machine, and deflating every float32 payload costs far more
+    CPU per send than it saves. Pass compression="deflate" for remote
+    viewers on slow links.
     """
 
-    def __init__(self, host: str = "localhost", port: int = 5666):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 5666,
+        compression: Optional[str] = None,
+    ):
         self.host = host
         self.port = port
+        self.compression = compression
         self._ws = None
+        self._use_msgpack = False
         self._server = None
         self._server_thread = None
         self._connected_event = threading.Event()
@@ -33,6 +146,13 @@ class ViewerClient:
         self._responses: Dict[str, dict] = {}
         self._send_lock = threading.Lock()
         self._current_animation = None  # Stored for re-sending on reconnect
+        self._handles: Dict[str, int] = {}  # Object ID -> integer handle
+        self._free_handles: List[int] = []  # Handles released by delete()
+        self._binary_ids = None  # Row IDs of the last batch_update_binary
+        self._binary_handles = None  # Their handles (uint16 array)
+        self._binary_handle_bytes = None  # Same, as padded bytes
+        self._binary_last = None  # Last rows sent, for change filtering
+        self._batch = None  # Buffered (header, payload) pairs, see batch_registration
 
     def connect(self, timeout: float = 30.0):
         """Start WebSocket server and wait for browser to connect."""
@@ -56,27 +176,34 @@ class ViewerClient:
     def _run_server(self):
         """Run the WebSocket server in a background thread."""
         with sync_serve(
-            self._handle_connection, self.host, self.port, max_size=64 * 1024 * 1024
+            self._handle_connection,
+            self.host,
+            self.port,
+            max_size=64 * 1024 * 1024,
+            select_subprotocol=self._select_subprotocol,
+            compression=self.compression,
         ) as server:
             self._server = server
             server.serve_forever()
 
+    def _select_subprotocol(self, connection, subprotocols) -> Optional[str]:
+        """Use msgpack if both sides support it, otherwise fall back to JSON."""
+        if msgpack is not None and MSGPACK_SUBPROTOCOL in subprotocols:
+            return MSGPACK_SUBPROTOCOL
+        return None
+
     def _handle_connection(self, websocket):
         """Handle incoming WebSocket connection from browser."""
+        self._use_msgpack = websocket.subprotocol == MSGPACK_SUBPROTOCOL
+        # Handles are per connection: the viewer starts with an empty table
+        self._reset_handles()
         self._ws = websocket
         self._connected_event.set()
 
         # Re-send animation if one was loaded (browser may have refreshed)
         if self._current_animation is not None:
             try:
-                websocket.send(
-                    json.dumps(
-                        {
-                            "type": "load_animation",
-                            "animation": self._current_animation,
-                        }
-                    )
-                )
+                websocket.send(self._encode(*self._current_animation))
             except Exception:
                 pass
 
@@ -109,18 +236,126 @@ class ViewerClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.disconnect()
 
-    def _send(self, data: dict) -> None:
-        """Send a message to the viewer."""
+    def _encode(
+        self, data: dict, payload: Optional[Payload] = None
+    ) -> Union[str, bytes]:
+        """
+        Encode a message for the connected viewer.
+
+        Plain messages are JSON text, unless the viewer negotiated the
+        msgpack subprotocol. Messages with a payload, and all messages in
+        msgpack mode, are binary:
+        [header_len (4 bytes)][header (padded to 4B)][payload]
+        """
+        if payload is None and not self._use_msgpack:
+            return json.dumps(data)
+        return b"".join([self._encode_header(data), *_payload_chunks(payload)])
+
+    def _encode_header(self, data: dict) -> bytes:
+        """Encode the length-prefixed, padded header of a binary message."""
+        if self._use_msgpack:
+            header = msgpack.packb(data, use_bin_type=True)
+        else:
+            header = json.dumps(data).encode("utf-8")
+
+        # Pad header to 4-byte alignment. JSON headers include the null
+        # padding in header_len; msgpack can't decode trailing bytes, so
+        # msgpack headers exclude it.
+        padding = b"\x00" * ((4 - (len(header) % 4)) % 4)
+        header_len = len(header) if self._use_msgpack else len(header + padding)
+
+        return struct.pack("<I", header_len) + header + padding
+
+    def _send(self, data: dict, payload: Optional[Payload] = None) -> None:
+        """
+        Send a message (with optional binary payload) to the viewer.
+
+        Large payloads are sent as WebSocket fragments [header, *chunks],
+        so they are never copied into a combined buffer first. The viewer
+        receives the reassembled message either way.
+        """
+        if self._batch is not None:
+            # Copy: the payload may be a view of an array the caller reuses
+            chunks = _payload_chunks(payload)
+            self._batch.append((data, b"".join(chunks) if chunks else None))
+            return
+
         ws = self._ws
         if not ws:
             raise RuntimeError("No viewer connected.")
+        chunks = _payload_chunks(payload)
         try:
             with self._send_lock:
-                ws.send(json.dumps(data))
+                if sum(len(c) for c in chunks) >= FRAGMENT_MIN_PAYLOAD:
+                    ws.send([self._encode_header(data), *chunks])
+                else:
+                    ws.send(self._encode(data, payload))
         except Exception as e:
             print(f"Send error: {e}")
             raise
 
+    @contextmanager
+    def batch_registration(self):
+        """
+        Buffer all messages inside the block and send them as one message.
+
+        Useful around loops of add_* calls: hundreds of objects are sent in
+        a single WebSocket message instead of one message each. Binary
+        payloads (models, polylines) are included. Methods that wait for a
+        reply from the viewer (sync, list_objects) can't be used inside.
+        If the block raises, the buffered messages are discarded and the
+        handles assigned inside the block are forgotten.
+
+        Example:
+            with viewer.batch_registration():
+                for i in range(500):
+                    viewer.add_sphere(f"s{i}", radius=0.1)
+        """
+        if self._batch is not None:  # Nested: the outer block sends
+            yield
+            return
+
+        self._batch = []
+        state = self._handle_state()
+        try:
+            yield
+        except BaseException:
+            # The viewer never sees these messages: undo what they registered
+            self._batch = None
+            self._restore_handle_state(state)
+            raise
+        batch, self._batch = self._batch, None
+        self._send_batch(batch)
+
+    def _send_batch(self, batch: list) -> None:
+        """
+        Send buffered messages as a single "batch" message.
+
+        Payloads are concatenated, each padded to 4 bytes, and located by
+        [offset, length] in "payloads" (null for messages without one).
+        """
+        if len(batch) <= 1:
+            for data, payload in batch:
+                self._send(data, payload)
+            return
+
+        messages, ranges, chunks = [], [], []
+        offset = 0
+        for data, payload in batch:
+            messages.append(data)
+            if payload is None:
+                ranges.append(None)
+                continue
+            padding = b"\x00" * ((4 - len(payload) % 4) % 4)
+            ranges.append([offset, len(payload)])
+            chunks += [payload, padding]
+            offset += len(payload) + len(padding)
+
+        self._send(
+            {"type": "batch", "messages": messages, "payloads": ranges},
+            chunks or None,
+        )
+
     # === Object Management ===
 
     def add_box(
@@ -236,6 +471,7 @@ class ViewerClient:
             {
                 "type": "add_object",
                 "id": id,
+                "handle": self._register_handle(id),
                 "object": {
                     "model": url,
                     "format": format,
@@ -266,27 +502,15 @@ class ViewerClient:
                 raise FileNotFoundError(f"Mesh file not found: {path}")
             mesh_bytes = path.read_bytes()
 
-        header = json.dumps(
+        self._send(
             {
                 "type": "add_model_binary",
                 "id": id,
+                "handle": self._register_handle(id),
                 "format": format,
-            }
-        ).encode("utf-8")
-
-        # Pad header to 4-byte alignment
-        padding_needed = (4 - (len(header) % 4)) % 4
-        header = header + b"\x00" * padding_needed
-
-        # Build binary message: [header_len (4 bytes)][header][mesh bytes]
-        header_len = struct.pack("<I", len(header))
-        binary_msg = header_len + header + mesh_bytes
-
-        ws = self._ws
-        if not ws:
-            raise RuntimeError("No viewer connected.")
-        with self._send_lock:
-            ws.send(binary_msg)
+            },
+            mesh_bytes,
+        )
 
     def add_polyline(
         self,
@@ -315,114 +539,65 @@ class ViewerClient:
         points = np.asarray(points, dtype=np.float32)
         if len(points.shape) == 2:
             n_points = points.shape[0]
-            points = points.flatten()
+            points = points.reshape(-1)
         else:
             n_points = len(points) // 3
 
-        # Process colors if provided
-        color_bytes = b""
-        has_vertex_colors = False
-        if colors is not None:
+        # Payload: [float32 xyz][uint8 rgb], written into one buffer so
+        # colors never go through a full-size float RGB intermediate
+        has_vertex_colors = colors is not None
+        if not has_vertex_colors:
+            payload = _as_bytes(points)
+        else:
+            payload = np.empty(points.nbytes + 3 * n_points, dtype=np.uint8)
+            payload[: points.nbytes].view(np.float32)[:] = points
+            rgb = payload[points.nbytes :].reshape(n_points, 3)
+
             colors = np.asarray(colors)
             if len(colors.shape) == 1:
                 if cmin is None:
                     cmin = float(colors.min())
                 if cmax is None:
                     cmax = float(colors.max())
-                colors_rgb = self._apply_colormap(colors, colormap, cmin, cmax)
+                lut = _COLORMAP_LUTS_U8.get(colormap, _COLORMAP_LUTS_U8["viridis"])
+                indices = self._colormap_indices(colors, len(lut), cmin, cmax)
+                lut.take(indices, axis=0, out=rgb)
             else:
-                colors_rgb = colors
-            colors_rgb = (np.clip(colors_rgb, 0, 1) * 255).astype(np.uint8)
-            color_bytes = colors_rgb.tobytes()
-            has_vertex_colors = True
-
-        raw_bytes = points.tobytes() + color_bytes
+                np.multiply(np.clip(colors, 0, 1), 255, out=rgb, casting="unsafe")
+            payload = _as_bytes(payload)
 
-        header = json.dumps(
+        self._send(
             {
                 "type": "add_polyline_binary",
                 "id": id,
+                "handle": self._register_handle(id),
                 "color": color,
                 "lineWidth": line_width,
                 "hasVertexColors": has_vertex_colors,
                 "numPoints": n_points,
-            }
-        ).encode("utf-8")
-
-        padding_needed = (4 - (len(header) % 4)) % 4
-        header = header + b"\x00" * padding_needed
-
-        header_len = struct.pack("<I", len(header))
-        binary_msg = header_len + header + raw_bytes
-
-        ws = self._ws
-        if not ws:
-            raise RuntimeError("No viewer connected.")
-        with self._send_lock:
-            ws.send(binary_msg)
+            },
+            payload,
+        )
 
     def _apply_colormap(
         self, values: np.ndarray, colormap: str, cmin: float, cmax: float
     ) -> np.ndarray:
         """Apply a colormap to scalar values."""
-        if cmax == cmin:
-            normalized = np.zeros_like(values)
-        else:
-            normalized = (values - cmin) / (cmax - cmin)
-        normalized = np.clip(normalized, 0, 1)
-
-        colormaps = {
-            "viridis": [
-                (0.267, 0.004, 0.329),
-                (0.282, 0.140, 0.458),
-                (0.254, 0.265, 0.530),
-                (0.207, 0.372, 0.553),
-                (0.164, 0.471, 0.558),
-                (0.128, 0.567, 0.551),
-                (0.135, 0.659, 0.518),
-                (0.267, 0.749, 0.441),
-                (0.478, 0.821, 0.318),
-                (0.741, 0.873, 0.150),
-                (0.993, 0.906, 0.144),
-            ],
-            "plasma": [
-                (0.050, 0.030, 0.528),
-                (0.295, 0.012, 0.615),
-                (0.492, 0.012, 0.659),
-                (0.665, 0.139, 0.614),
-                (0.798, 0.280, 0.470),
-                (0.899, 0.396, 0.301),
-                (0.973, 0.559, 0.055),
-                (0.940, 0.975, 0.131),
-            ],
-            "turbo": [
-                (0.190, 0.072, 0.232),
-                (0.217, 0.336, 0.855),
-                (0.134, 0.659, 0.918),
-                (0.121, 0.866, 0.706),
-                (0.400, 0.974, 0.371),
-                (0.691, 0.974, 0.171),
-                (0.938, 0.847, 0.102),
-                (0.999, 0.582, 0.084),
-                (0.945, 0.278, 0.086),
-                (0.700, 0.072, 0.150),
-            ],
-        }
+        lut = _COLORMAP_LUTS.get(colormap, _COLORMAP_LUTS["viridis"])
+        return lut.take(self._colormap_indices(values, len(lut), cmin, cmax), axis=0)
 
-        cmap = colormaps.get(colormap, colormaps["viridis"])
-        n_colors = len(cmap)
+    def _colormap_indices(
+        self, values: np.ndarray, size: int, cmin: float, cmax: float
+    ) -> np.ndarray:
+        """Map scalar values to indices into a colormap LUT of given size."""
+        scale = (size - 1) / (cmax - cmin) if cmax != cmin else 0.0
 
-        indices = normalized * (n_colors - 1)
-        lower = np.floor(indices).astype(int)
-        upper = np.minimum(lower + 1, n_colors - 1)
-        frac = indices - lower
-
-        cmap_arr = np.array(cmap)
-        result = (
-            cmap_arr[lower] * (1 - frac[:, np.newaxis])
-            + cmap_arr[upper] * frac[:, np.newaxis]
-        )
-        return result.astype(np.float32)
+        # Normalize in a single float32 buffer, then convert once
+        indices = np.subtract(values, cmin, dtype=np.float32)
+        indices *= scale
+        np.clip(indices, 0, size - 1, out=indices)
+        np.rint(indices, out=indices)
+        return indices.astype(np.intp)
 
     def _add_primitive(
         self,
@@ -446,6 +621,7 @@ class ViewerClient:
             {
                 "type": "add_object",
                 "id": id,
+                "handle": self._register_handle(id),
                 "object": {
                     "primitive": primitive,
                     "params": params,
@@ -454,6 +630,39 @@ class ViewerClient:
             }
         )
 
+    def add_objects(self, objects: List[dict]) -> None:
+        """
+        Add many objects in a single message.
+
+        Args:
+            objects: List of {"type": ..., "id": ..., "params": {...}} dicts.
+                type is one of box, sphere, cylinder, capsule, model,
+                model_binary or polyline; params are the keyword arguments
+                of the matching add_* method.
+
+        Example:
+            viewer.add_objects([
+                {"type": "sphere", "id": "s1", "params": {"radius": 0.5}},
+                {"type": "box", "id": "b1", "params": {"color": 0xFF0000}},
+            ])
+        """
+        add_methods = {
+            "box": self.add_box,
+            "sphere": self.add_sphere,
+            "cylinder": self.add_cylinder,
+            "capsule": self.add_capsule,
+            "model": self.add_model,
+            "model_binary": self.add_model_binary,
+            "polyline": self.add_polyline,
+        }
+        for spec in objects:
+            if spec["type"] not in add_methods:
+                raise ValueError(f"Unknown object type: {spec['type']}")
+
+        with self.batch_registration():
+            for spec in objects:
+                add_methods[spec["type"]](spec["id"], **spec.get("params", {}))
+
     # === Transform Updates ===
 
     def set_position(self, id: str, x: float, y: float, z: float):
@@ -479,17 +688,136 @@ class ViewerClient:
         Update multiple object transforms in a single message.
         Optimized for high-frequency updates (60fps).
         """
-        self._send({"type": "batch_update", "transforms": transforms})
+        self._send(
+            {
+                "type": "batch_update",
+                "handles": self._get_handles(transforms.keys()),
+                "transforms": list(transforms.values()),
+            }
+        )
+
+    def batch_update_binary(
+        self, ids: List[str], transforms: np.ndarray, epsilon: Optional[float] = None
+    ):
+        """
+        Update multiple object transforms from a single float32 block.
+
+        Faster than batch_update() for many objects at high frame rates:
+        the block is sent as raw bytes, without per-object dicts or JSON.
+        Objects are addressed by integer handles instead of ID strings.
+
+        Args:
+            ids: Object IDs, one per row of transforms
+            transforms: array of shape (N, 8) with rows
+                [px, py, pz, qx, qy, qz, qw, scale]
+            epsilon: If given, only send rows where some value changed by
+                more than epsilon since the last batch_update_binary with
+                the same ids. Other transform calls on these objects are
+                not tracked.
+        """
+        transforms = np.ascontiguousarray(transforms, dtype=np.float32)
+        if transforms.shape != (len(ids), 8):
+            raise ValueError(
+                f"Expected transforms of shape ({len(ids)}, 8), got {transforms.shape}"
+            )
+
+        ids = tuple(ids)
+        if ids != self._binary_ids:
+            self._binary_handles = np.array(self._get_handles(ids), dtype=np.uint16)
+            self._binary_handle_bytes = _pad4(self._binary_handles.tobytes())
+            self._binary_ids = ids
+            self._binary_last = None
+
+        # Payload: [uint16 handles (padded to 4B)][float32 rows]
+        handle_bytes = self._binary_handle_bytes
+        rows = transforms
+        if self._binary_last is None:
+            self._binary_last = transforms.copy()
+        elif epsilon is None:
+            np.copyto(self._binary_last, transforms)
+        else:
+            changed = np.any(np.abs(transforms - self._binary_last) > epsilon, axis=1)
+            if not changed.any():
+                return
+            if not changed.all():
+                handle_bytes = _pad4(self._binary_handles[changed].tobytes())
+                rows = transforms[changed]
+            self._binary_last[changed] = rows
+
+        self._send(
+            {"type": "batch_update_binary", "count": len(rows)},
+            [handle_bytes, _as_bytes(rows)],
+        )
 
     def set_transforms(self, matrices: Dict[str, List[float]]):
         """Update multiple objects with 4x4 matrices in a single call."""
-        transforms = {id: {"matrix": matrix} for id, matrix in matrices.items()}
-        self._send({"type": "batch_update", "transforms": transforms})
+        self.batch_update({id: {"matrix": matrix} for id, matrix in matrices.items()})
+
+    def _register_handle(self, id: str) -> Optional[int]:
+        """Assign an integer handle to an object ID (None when exhausted)."""
+        handle = self._handles.get(id)
+        if handle is None:
+            if self._free_handles:
+                handle = self._handles[id] = self._free_handles.pop()
+            elif len(self._handles) < MAX_HANDLES:
+                # Without released handles, 0..len-1 are all in use
+                handle = self._handles[id] = len(self._handles)
+        return handle
+
+    def _release_handle(self, id: str) -> None:
+        """Return an object's handle to the free list for reuse."""
+        handle = self._handles.pop(id, None)
+        if handle is not None:
+            self._free_handles.append(handle)
+            if self._binary_ids is not None and id in self._binary_ids:
+                self._binary_ids = None
+                self._binary_last = None
+
+    def _handle_state(self) -> tuple:
+        """Snapshot the handle table and batch_update_binary cache."""
+        last = self._binary_last
+        return (
+            dict(self._handles),
+            list(self._free_handles),
+            self._binary_ids,
+            self._binary_handles,
+            self._binary_handle_bytes,
+            None if last is None else last.copy(),
+        )
+
+    def _restore_handle_state(self, state: tuple) -> None:
+        """Restore a snapshot taken by _handle_state."""
+        (
+            self._handles,
+            self._free_handles,
+            self._binary_ids,
+            self._binary_handles,
+            self._binary_handle_bytes,
+            self._binary_last,
+        ) = state
+
+    def _reset_handles(self) -> None:
+        """Forget all handles (new connection or cleared scene)."""
+        self._handles.clear()
+        self._free_handles.clear()
+        self._binary_ids = None
+        self._binary_last = None
+
+    def _get_handles(self, ids) -> List[int]:
+        """Get handles for object IDs, registering unknown IDs with the viewer."""
+        new_ids = [id for id in ids if id not in self._handles]
+        if new_ids:
+            if len(self._handles) + len(new_ids) > MAX_HANDLES:
+                raise RuntimeError(f"Too many object IDs (max {MAX_HANDLES})")
+            new_handles = {id: self._register_handle(id) for id in new_ids}
+            self._send({"type": "register_handles", "handles": new_handles})
+        return [self._handles[id] for id in ids]
 
     # === Object Operations ===
 
     def delete(self, id: str) -> None:
         """Delete an object from the scene."""
+        self._release_handle(id)
         self._send({"type": "delete_object", "id": id})
 
     def set_visible(self, id: str, visible: bool = True):
@@ -510,6 +838,7 @@ class ViewerClient:
 
     def clear(self) -> None:
         """Clear all objects from the scene."""
+        self._reset_handles()
         self._send({"type": "clear_scene"})
 
     def sync(self, objects: Dict[str, dict], timeout: float = 5.0) -> dict:
@@ -553,6 +882,7 @@ class ViewerClient:
                 {
                     "type": "add_object",
                     "id": obj_id,
+                    "handle": self._register_handle(obj_id),
                     "object": objects[obj_id],
                 }
             )
@@ -561,7 +891,7 @@ class ViewerClient:
 
     # === Animation ===
 
-    def load_animation(self, animation) -> None:
+    def load_animation(self, animation, quantize: bool = False) -> None:
         """
         Load an animation for playback in the viewer.
 
@@ -570,6 +900,8 @@ class ViewerClient:
 
         Args:
             animation: Animation object with pre-computed frames
+            quantize: Send the rotation/scale part of a preallocated
+                animation as int16 fixed-point (see Animation.to_binary)
 
         Example:
             frames = []
@@ -581,15 +913,19 @@ class ViewerClient:
                 ))
             animation = Animation(frames=frames, loop=True)
             viewer.load_animation(animation)
+
+        Animations filled through Animation.preallocate() are sent as a
+        binary float32 payload instead of JSON.
         """
-        animation_dict = animation.to_dict()
-        self._current_animation = animation_dict  # Store for reconnect
-        self._send(
-            {
-                "type": "load_animation",
-                "animation": animation_dict,
-            }
-        )
+        if animation.is_preallocated:
+            animation_dict, payload = animation.to_binary(quantize=quantize)
+        elif quantize:
+            raise ValueError("quantize requires a preallocated animation")
+        else:
+            animation_dict, payload = animation.to_dict(), None
+        message = {"type": "load_animation", "animation": animation_dict}
+        self._current_animation = (message, payload)  # Store for reconnect
+        self._send(message, payload)
 
     def stop_animation(self) -> None:
         """Stop animation playback and return to real-time mode."""
@@ -613,6 +949,8 @@ class ViewerClient:
         return response.get("objects", [])
 
 
-def viewer(host: str = "localhost", port: int = 5666) -> ViewerClient:
+def viewer(
+    host: str = "localhost", port: int = 5666, compression: Optional[str] = None
+) -> ViewerClient:
     """Create and connect a viewer client (starts WebSocket server)."""
-    return ViewerClient(host, port).connect()
+    return ViewerClient(host, port, compression=compression).connect()
@@ -1,6 +1,7 @@
 """Tests for Animation classes."""
 
 import numpy as np
+import pytest
 
 from threejs_viewer import Animation, AnimationRecorder, Frame, Marker
 
@@ -114,3 +115,81 @@ def test_recorder_times():
     assert len(times) == 20
     assert times[0] == 0.0
     assert np.isclose(times[-1], 1.9)
+
+
+def test_animation_preallocate():
+    """Test dense transform buffers of a preallocated animation."""
+    animation = Animation(loop=False)
+    animation.preallocate(["a", "b"], n_frames=10)
+    animation.times[:] = np.arange(10) / 10
+    animation.matrices[:, 1, 12] = np.arange(10)
+
+    assert animation.is_preallocated
+    assert animation.n_frames == 10
+    assert np.isclose(animation.duration, 0.9)
+    assert animation.matrices.shape == (10, 2, 16)
+    assert animation.matrices.dtype == np.float32
+    # Unfilled transforms default to identity
+    assert np.array_equal(animation.matrices[3, 0].reshape(4, 4), np.eye(4))
+
+
+def test_animation_preallocate_excludes_frames():
+    """Test that preallocated buffers and add_frame cannot be mixed."""
+    animation = Animation()
+    animation.preallocate(["a"], n_frames=2)
+    with pytest.raises(RuntimeError):
+        animation.add_frame(0.0, {}, colors={"a": 0xFF0000})
+
+    animation = Animation()
+    animation.add_frame(0.0, {"a": {"position": [0, 0, 0]}})
+    with pytest.raises(RuntimeError):
+        animation.preallocate(["a"], n_frames=2)
+
+
+def test_preallocated_animations_compare():
+    """Test that comparing preallocated animations does not raise."""
+    a, b = Animation(), Animation()
+    a.preallocate(["a"], n_frames=2)
+    b.preallocate(["a"], n_frames=2)
+    assert a == b
+
+
+def test_animation_to_binary():
+    """Test binary serialization of a preallocated animation."""
+    animation = Animation()
+    animation.preallocate(["a", "b", "c"], n_frames=4)
+    animation.times[:] = [0.0, 0.5, 1.0, 1.5]
+    animation.matrices[:] = np.arange(4 * 3 * 16).reshape(4, 3, 16)
+    animation.add_marker(1.0, "Mid")
+
+    header, payload = animation.to_binary()
+
+    assert header["ids"] == ["a", "b", "c"]
+    assert header["n_frames"] == 4
+    assert header["markers"][0]["label"] == "Mid"
+    data = np.frombuffer(payload, dtype=np.float32)
+    assert np.array_equal(data[:4], animation.times)
+    assert np.array_equal(data[4:].reshape(4, 3, 16), animation.matrices)
+
+
+def test_animation_to_binary_quantized():
+    """Test int16 quantization of the rotation/scale part."""
+    animation = Animation()
+    animation.preallocate(["a", "b"], n_frames=5)
+    animation.times[:] = np.arange(5) / 5
+    rng = np.random.default_rng(0)
+    animation.matrices[..., [0, 1, 2, 4, 5, 6, 8, 9, 10]] = rng.uniform(
+        -1, 1, (5, 2, 9)
+    )
+    animation.matrices[..., 12:15] = rng.uniform(-10, 10, (5, 2, 3))
+
+    header, payload = animation.to_binary(quantize=True)
+
+    scale = header["rotation_scale"]
+    assert len(payload) == 5 * 4 + 5 * 2 * (3 * 4 + 9 * 2)
+    translations = np.frombuffer(payload, np.float32, 5 * 2 * 3, offset=5 * 4)
+    rotations = np.frombuffer(payload, np.int16, offset=5 * 4 + 5 * 2 * 3 * 4)
+    assert np.array_equal(translations.reshape(5, 2, 3), animation.matrices[..., 12:15])
+    restored = rotations.reshape(5, 2, 9) * scale
+    original = animation.matrices[..., [0, 1, 2, 4, 5, 6, 8, 9, 10]]
+    assert np.abs(restored - original).max() <= scale / 2 + 1e-7
@@ -1,8 +1,38 @@
 """Tests for ViewerClient."""
 
+import json
+import struct
 from pathlib import Path
 
-from threejs_viewer import ViewerClient
+import numpy as np
+import pytest
+
+from threejs_viewer import Animation, ViewerClient
+from threejs_viewer.client import MAX_HANDLES
+
+
+class FakeWebSocket:
+    """Records messages instead of sending them."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(message)
+
+
+@pytest.fixture
+def client():
+    """A ViewerClient without a server or viewer."""
+    return ViewerClient()
+
+
+@pytest.fixture
+def sent_messages(client):
+    """(header, payload) pairs passed to client._send instead of sending them."""
+    sent = []
+    client._send = lambda data, payload=None: sent.append((data, payload))
+    return sent
 
 
 def test_client_instantiation():
@@ -19,6 +49,12 @@ def test_client_custom_host_port():
     assert client.port == 8080
 
 
+def test_client_compression_default_off():
+    """Test that per-message compression is opt-in."""
+    assert ViewerClient().compression is None
+    assert ViewerClient(compression="deflate").compression == "deflate"
+
+
 def test_viewer_path():
     """Test that viewer_path points to existing file."""
     client = ViewerClient()
@@ -27,3 +63,226 @@ def test_viewer_path():
     assert isinstance(path, Path)
     assert path.exists()
     assert path.name == "viewer.html"
+
+
+def test_encode_json_text_message():
+    """Test that plain messages are JSON text by default."""
+    client = ViewerClient()
+    message = client._encode({"type": "clear_scene"})
+
+    assert isinstance(message, str)
+    assert json.loads(message) == {"type": "clear_scene"}
+
+
+def test_encode_binary_message_framing():
+    """Test binary framing: [header_len][padded JSON header][payload]."""
+    client = ViewerClient()
+    payload = b"\x01\x02\x03"
+    message = client._encode({"type": "add_model_binary", "id": "m"}, payload)
+
+    (header_len,) = struct.unpack("<I", message[:4])
+    assert header_len % 4 == 0
+    header = json.loads(message[4 : 4 + header_len].rstrip(b"\x00"))
+    assert header == {"type": "add_model_binary", "id": "m"}
+    assert message[4 + header_len :] == payload
+
+
+def test_encode_msgpack_message():
+    """Test that all messages are msgpack-framed binary in msgpack mode."""
+    msgpack = pytest.importorskip("msgpack")
+    client = ViewerClient()
+    client._use_msgpack = True
+    message = client._encode({"type": "clear_scene"})
+
+    (header_len,) = struct.unpack("<I", message[:4])
+    assert msgpack.unpackb(message[4 : 4 + header_len]) == {"type": "clear_scene"}
+    assert len(message) % 4 == 0
+
+
+def test_batch_update_binary_shape_mismatch():
+    """Test that batch_update_binary rejects blocks not shaped (N, 8)."""
+    client = ViewerClient()
+
+    with pytest.raises(ValueError):
+        client.batch_update_binary(["a", "b"], np.zeros((2, 7)))
+
+
+def test_batch_update_uses_handles(client, sent_messages):
+    """Test that objects are addressed by integer handles in batch updates."""
+    client.add_sphere("a")
+    client.batch_update({"a": {"position": [1, 2, 3]}, "b": {"position": [0, 0, 0]}})
+
+    headers = [data for data, _ in sent_messages]
+    assert headers[0]["handle"] == 0
+    # "b" was not added in this session, so it is registered first
+    assert headers[1] == {"type": "register_handles", "handles": {"b": 1}}
+    assert headers[2]["handles"] == [0, 1]
+
+
+def test_handles_are_reused(client, sent_messages):
+    """Test that deleted and cleared objects give their handles back."""
+    for i in range(MAX_HANDLES + 10):
+        client.add_sphere(f"s{i}")
+        client.batch_update({f"s{i}": {"position": [0, 0, 0]}})
+        client.delete(f"s{i}")
+    assert client._handles == {}
+
+    client.add_sphere("a")
+    client.add_sphere("b")
+    client.delete("a")
+    client.add_sphere("c")
+    assert client._handles == {"b": 1, "c": 0}
+
+    client.clear()
+    client.add_sphere("d")
+    assert client._handles == {"d": 0}
+
+
+def test_batch_update_binary_skips_unchanged_rows(client, sent_messages):
+    """Test that epsilon filtering only sends rows that changed."""
+    ids = ["a", "b", "c"]
+    transforms = np.zeros((3, 8), dtype=np.float32)
+    client.batch_update_binary(ids, transforms, epsilon=1e-4)
+    assert sent_messages[-1][0]["count"] == 3
+
+    # Nothing changed beyond epsilon: nothing is sent
+    transforms[0, 0] = 1e-5
+    client.batch_update_binary(ids, transforms, epsilon=1e-4)
+    assert sent_messages[-1][0]["count"] == 3
+
+    transforms[2, 1] = 1.0
+    client.batch_update_binary(ids, transforms, epsilon=1e-4)
+    data, (handle_bytes, rows) = sent_messages[-1]
+    assert data["count"] == 1
+    assert np.frombuffer(handle_bytes, np.uint16)[0] == client._handles["c"]
+    assert np.frombuffer(rows, np.float32)[1] == 1.0
+
+    # Clearing the scene forgets what was sent
+    client.clear()
+    client.batch_update_binary(ids, transforms, epsilon=1e-4)
+    assert sent_messages[-1][0]["count"] == 3
+
+
+def test_load_preallocated_animation_is_binary(client, sent_messages):
+    """Test that preallocated animations are sent with a float32 payload."""
+    animation = Animation()
+    animation.preallocate(["a"], n_frames=3)
+    client.load_animation(animation)
+
+    data, payload = sent_messages[0]
+    assert data["type"] == "load_animation"
+    assert data["animation"]["ids"] == ["a"]
+    assert len(payload) == 3 * 4 + 3 * 16 * 4
+    assert client._current_animation == (data, payload)
+
+
+def test_load_animation_quantize_requires_preallocated(client, sent_messages):
+    """Test that quantize is rejected for frame-based animations."""
+    animation = Animation()
+    animation.add_frame(time=0.0, transforms={"a": list(range(16))})
+    with pytest.raises(ValueError):
+        client.load_animation(animation, quantize=True)
+
+
+def test_send_fragments_large_payloads():
+    """Test that large payloads are sent as fragments without concatenation."""
+    client = ViewerClient()
+    client._ws = FakeWebSocket()
+    header = {"type": "add_model_binary", "id": "m"}
+
+    client._send(header, b"\x01\x02")
+    small = client._ws.sent[-1]
+    assert isinstance(small, bytes)
+    assert small.endswith(b"\x01\x02")
+
+    big = np.arange(100_000, dtype=np.float32)
+    client._send(header, [memoryview(big).cast("B"), b""])
+    fragments = client._ws.sent[-1]
+    assert isinstance(fragments, list)
+    assert b"".join(fragments) == client._encode(header, big.tobytes())
+    assert fragments[1].obj is big  # Sent straight from the array's buffer
+
+
+def test_add_polyline_payload_layout(client, sent_messages):
+    """Test that polyline payloads are float32 xyz followed by uint8 rgb."""
+    points = np.array([[0, 1, 2], [3, 4, 5]], dtype=np.float64)
+    client.add_polyline("line", points, colors=[0.0, 1.0], colormap="turbo")
+
+    data, payload = sent_messages[0]
+    assert data["numPoints"] == 2
+    assert data["hasVertexColors"] is True
+    payload = bytes(payload)
+    assert len(payload) == 2 * 12 + 2 * 3
+    np.testing.assert_array_equal(np.frombuffer(payload[:24], np.float32), range(6))
+    rgb = np.frombuffer(payload[24:], np.uint8).reshape(2, 3)
+    np.testing.assert_array_equal(
+        rgb[0], (np.float32([0.190, 0.072, 0.232]) * 255).astype(np.uint8)
+    )
+    np.testing.assert_array_equal(
+        rgb[1], (np.float32([0.700, 0.072, 0.150]) * 255).astype(np.uint8)
+    )
+
+
+def test_batch_registration_sends_one_message():
+    """Test that messages inside batch_registration are sent together."""
+    client = ViewerClient()
+    client._ws = FakeWebSocket()
+
+    with client.batch_registration():
+        client.add_sphere("s", radius=0.5)
+        client.add_model_binary("m", b"solid")
+        client.add_polyline("p", np.zeros((2, 3)))
+        assert client._ws.sent == []
+
+    (message,) = client._ws.sent
+    (header_len,) = struct.unpack("<I", message[:4])
+    header = json.loads(message[4 : 4 + header_len].rstrip(b"\x00"))
+    assert header["type"] == "batch"
+    assert [m["id"] for m in header["messages"]] == ["s", "m", "p"]
+    assert header["payloads"] == [None, [0, 5], [8, 24]]
+    assert len(message) == 4 + header_len + 8 + 24
+
+
+def test_batch_registration_discards_on_error():
+    """Test that nothing is sent when the batch_registration block raises."""
+    client = ViewerClient()
+    client._ws = FakeWebSocket()
+
+    client.batch_update_binary(["a"], np.zeros((1, 8)), epsilon=1e-4)
+    client._ws.sent.clear()
+
+    with pytest.raises(FileNotFoundError), client.batch_registration():
+        client.add_sphere("s")
+        client.batch_update_binary(["a"], np.ones((1, 8)), epsilon=1e-4)
+        client.add_model_binary("m", "/missing.stl")
+
+    assert client._ws.sent == []
+    # Handles and change filtering are as if the block never ran
+    assert client._handles == {"a": 0}
+    assert np.array_equal(client._binary_last, np.zeros((1, 8)))
+    client.add_sphere("t")
+    assert len(client._ws.sent) == 1
+
+
+def test_send_batch_payload_ranges(client, sent_messages):
+    """Test batch message layout: headers plus padded, concatenated payloads."""
+    client._send_batch(
+        [({"type": "a"}, None), ({"type": "b"}, b"12345"), ({"type": "c"}, b"xy")]
+    )
+
+    ((data, chunks),) = sent_messages
+    assert data["type"] == "batch"
+    assert [m["type"] for m in data["messages"]] == ["a", "b", "c"]
+    assert data["payloads"] == [None, [0, 5], [8, 2]]
+    payload = b"".join(chunks)
+    assert payload[0:5] == b"12345"
+    assert payload[8:10] == b"xy"
+
+
+def test_add_objects_unknown_type(client, sent_messages):
+    """Test that add_objects rejects unknown object types before sending."""
+    with pytest.raises(ValueError):
+        client.add_objects(
+            [{"type": "sphere", "id": "s"}, {"type": "torus", "id": "t"}]
+        )
+    assert sent_messages == []
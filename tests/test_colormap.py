@@ -69,3 +69,14 @@ def test_unknown_colormap_defaults_to_viridis():
 
     # Should use viridis instead
     assert result.shape == (3, 3)
+
+
+def test_colormap_endpoints():
+    """Test that cmin and cmax map to the first and last colormap colors."""
+    client = ViewerClient()
+
+    values = np.array([0.0, 10.0])
+    result = client._apply_colormap(values, "turbo", 0.0, 10.0)
+
+    np.testing.assert_allclose(result[0], [0.190, 0.072, 0.232], atol=1e-6)
+    np.testing.assert_allclose(result[1], [0.700, 0.072, 0.150], atol=1e-6)